@@ -19,7 +19,7 @@
  *   - Connects via Ethernet (built-in to Olimex board)
  *   - PoE provides both power and network connectivity
  *   - Sends UDP packet to Raspberry Pi IP at port 5005
- *   - Packet format: "D1:xxx,D2:xxx\n"
+ *   - Packet format: 13-byte binary <BIff> (magic 0xA6, seq, d1, d2)
  *   - Measurement cycle: 100ms (every 100ms send new reading)
  *
  * Power:
@@ -80,6 +80,10 @@ static bool eth_initialized = false; // Prevent re-initialization
 float distance_1_cm = 0.0;
 float distance_2_cm = 0.0;
 
+// Binary packet header
+const uint8_t PACKET_MAGIC = 0xA6; // Marks binary packet (Pi still accepts legacy text)
+uint32_t packet_seq = 0;           // Sequence number, lets Pi drop duplicate/reordered packets
+
 // ============================================
 // ETH EVENT HANDLERS
 // ============================================
@@ -177,8 +181,11 @@ float readSR04(uint8_t trig_pin, uint8_t echo_pin)
 void sendUDPPacket(float dist1, float dist2)
 {
   /*
-   * Format: "D1:xxx.x,D2:yyy.y\n"
-   * Example: "D1:45.3,D2:67.8\n"
+   * Format: 13 bytes, little-endian <BIff>
+   *   byte 0:     magic/version 0xA6
+   *   bytes 1-4:  sequence number (uint32, wraps)
+   *   bytes 5-8:  distance 1 (float32 cm)
+   *   bytes 9-12: distance 2 (float32 cm)
    * -1.0 values indicate sensor error/timeout
    */
 
@@ -187,15 +194,20 @@ void sendUDPPacket(float dist1, float dist2)
     return; // Don't send if not connected
   }
 
-  char buffer[64];
-  snprintf(buffer, sizeof(buffer), "D1:%.1f,D2:%.1f\n", dist1, dist2);
+  // ESP32 is little-endian, so fields are copied as-is
+  uint8_t buffer[13];
+  buffer[0] = PACKET_MAGIC;
+  memcpy(&buffer[1], &packet_seq, sizeof(packet_seq));
+  memcpy(&buffer[5], &dist1, sizeof(float));
+  memcpy(&buffer[9], &dist2, sizeof(float));
+  packet_seq++;
 
   // Send via UDP
   IPAddress targetIP;
   targetIP.fromString(udp_target_ip);
   
   udp.beginPacket(targetIP, udp_target_port);
-  udp.write((uint8_t *)buffer, strlen(buffer));
+  udp.write(buffer, sizeof(buffer));
   udp.endPacket();
 }
 
@@ -387,7 +399,7 @@ void loop()
  * 5. UDP NETWORKING:
  *    - Target: Raspberry Pi at configured IP (e.g., 192.168.1.100)
  *    - Port: 5005 (UDP)
- *    - Format: "D1:45.3,D2:67.8\n"
+ *    - Format: 13-byte binary <BIff> (magic 0xA6, uint32 seq, d1, d2 as float32)
  *    - Interval: 100ms (10 readings/sec)
  *
  * 6. TROUBLESHOOTING TG1WDT_SYS_RESET:
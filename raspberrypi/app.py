@@ -19,7 +19,8 @@ Hardware:
 
 Network:
   - Receives UDP packets from ESP32-C6 at mezzanine
-  - Packet format: "D1:xxx.x,D2:yyy.y\n"
+  - Packet format: 13-byte binary <BIff> (magic 0xA6, seq, d1, d2)
+    Legacy text "D1:xxx.x,D2:yyy.y\n" still accepted
   - Listens on configured UDP port (default 5005)
 
 Configuration:
@@ -28,27 +29,84 @@ Configuration:
 """
 
 import socket
+import select
+import selectors
+import errno
+import ctypes
 import json
+import logging
+import logging.handlers
+import re
+import struct
 import threading
+import queue
 import time
 import os
 import signal
 import sys
-import subprocess
-from pathlib import Path
+import tempfile
+import wave
+import io
+import statistics
 from datetime import datetime, timedelta
 
+# Runtime logging (status lines, alerts, errors) goes through a queue so the
+# stdout write happens on a background thread, not the main receive/monitor loop.
+# Startup and config messages still use print.
+log = logging.getLogger("forklift")
+log.setLevel(logging.INFO)
+log.propagate = False
+_log_queue = queue.Queue(-1)
+log.addHandler(logging.handlers.QueueHandler(_log_queue))
+_log_handler = logging.StreamHandler(sys.stdout)
+_log_handler.setFormatter(logging.Formatter("%(message)s"))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_handler)
+_log_listener.start()
+
+# Clock for all interval/timeout arithmetic. Monotonic so NTP slews or the
+# X1200 RTC setting the clock at boot can't wedge pause or throttle logic.
+# Wall-clock time is only used for display (datetime.now()).
+_now = time.monotonic
+
+try:
+    import gpiod  # libgpiod v2 bindings (pip3 install gpiod)
+    from gpiod.line import Bias, Edge
+except ImportError:
+    gpiod = None
+
 try:
     from gpiozero import Button
 except ImportError:
-    print("Warning: gpiozero not installed. GPIO features disabled.")
+    if gpiod is None:
+        print("Warning: gpiod and gpiozero not installed. GPIO features disabled.")
     Button = None
 
+try:
+    import orjson  # Optional: faster JSON parsing
+except ImportError:
+    orjson = None
+
+try:
+    import numpy  # Optional: vectorized median filter over recent readings
+except ImportError:
+    numpy = None
+
+try:
+    import alsaaudio
+except ImportError:
+    print("Warning: pyalsaaudio not installed. Falling back to aplay for audio.")
+    alsaaudio = None
+
 
 # ============================================
 # CONFIGURATION LOADING
 # ============================================
 
+# Parsed config files: path -> (st_mtime_ns, parsed dict).
+# Avoids re-reading and re-parsing an unchanged file on every Config().
+_CONFIG_CACHE = {}
+
+
 class Config:
     """Load and manage system configuration."""
     
@@ -65,25 +123,39 @@ class Config:
             "pause_duration_seconds": 120,
             "alert_wav_path": "/home/mark/Mezzanine/raspberrypi/alert.wav",
             "pause_button_gpio": 17,
+            "pause_button_gpiochip": "/dev/gpiochip4",  # Pi 5 header GPIOs (RP1)
             "min_interval_between_alerts_sec": 1.0,
             "audio_output": "usb",  # Options: "usb", "gpio_pwm", "headphone_jack", or "hdmi"
+            "udp_rcvbuf_bytes": 4 * 1024 * 1024,  # Kernel receive buffer (capped by net.core.rmem_max)
+            "udp_rx_cpus": [3],  # CPUs for the main receive loop (null = no pinning)
+            "udp_rx_nice": -5,  # Receive loop nice value (needs CAP_SYS_NICE)
+            "udp_socket_priority": 6,  # SO_PRIORITY for the UDP socket (0-6)
+            "distance_filter_window": 5,  # Median over last N readings (1 = no filtering)
         }
         
         try:
             if os.path.exists(self.config_path):
                 # Track file modification time
-                self.last_mtime = os.path.getmtime(self.config_path)
+                st = os.stat(self.config_path)
+                self.last_mtime = st.st_mtime
+                
+                cached = _CONFIG_CACHE.get(self.config_path)
+                if cached and cached[0] == st.st_mtime_ns:
+                    loaded = cached[1]
+                else:
+                    with open(self.config_path, 'rb') as f:
+                        raw = f.read()
+                    loaded = orjson.loads(raw) if orjson is not None else json.loads(raw)
+                    _CONFIG_CACHE[self.config_path] = (st.st_mtime_ns, loaded)
                 
-                with open(self.config_path, 'r') as f:
-                    loaded = json.load(f)
-                    defaults.update(loaded)
-                    print(f"[Config] Loaded from {self.config_path}")
+                defaults.update(loaded)
+                print(f"[Config] Loaded from {self.config_path}")
             else:
                 print(f"[Config] File not found: {self.config_path}")
                 print(f"[Config] Using defaults. Create {self.config_path} to customize.")
         except Exception as e:
             print(f"[Config] Error loading config: {e}")
-            print(f"[Config] Using defaults.")
+            print("[Config] Using defaults.")
         
         return defaults
     
@@ -99,7 +171,7 @@ class Config:
             
             current_mtime = os.path.getmtime(self.config_path)
             if current_mtime > self.last_mtime:
-                print(f"[Config] File modified, reloading...")
+                print("[Config] File modified, reloading...")
                 self.data = self._load_config()
                 return True
         except Exception as e:
@@ -117,6 +189,23 @@ class Config:
 class AudioAlert:
     """Manage horn warning audio playback."""
     
+    # ALSA device for each output mode
+    ALSA_DEVICES = {
+        # On Pi 5 with PWM overlay, the headphones device routes to GPIO 12/13
+        "gpio_pwm": "plughw:Headphones",
+        # Onboard 3.5mm jack/speaker - the built-in audio output on Raspberry Pi
+        "headphone_jack": "plughw:Headphones",
+        # Simple hdmi device usually works best
+        # Alternative if it fails: "hw:CARD=vc4hdmi0"
+        "hdmi": "hdmi",
+        # USB audio - card 1, device 0 (AB13X USB Audio)
+        "usb": "plughw:1,0",
+    }
+    
+    PERIOD_FRAMES = 1024  # ALSA period size used for the persistent PCM stream
+    APLAY_TIMEOUT_SEC = 10  # Kill a hung aplay so the player thread keeps serving alerts
+    PCM_REOPEN_SEC = 5.0  # Minimum seconds between attempts to reopen a failed ALSA stream
+    
     def __init__(self, wav_path, output_mode="usb"):
         """
         Initialize audio alert system.
@@ -132,6 +221,17 @@ class AudioAlert:
         self.last_alert_time = 0
         self.min_interval = 1.0  # Minimum seconds between alerts
         self.output_mode = output_mode
+        self.device = self.ALSA_DEVICES.get(output_mode, self.ALSA_DEVICES["usb"])
+        
+        # Whole WAV file, read once. Missing or invalid file fails at startup.
+        self._wav_bytes = self._load_wav()
+        
+        # Persistent PCM stream (None = fall back to aplay per alert)
+        self._pcm = None
+        self._pcm_bytes = b""
+        self._period_bytes = 0
+        self._pcm_reopen_at = None  # Set after an open/write error; when to retry _open_pcm
+        self._wav_fd = None  # In-memory copy of the WAV for aplay's stdin
         
         if self.output_mode == "gpio_pwm":
             print("[Alert] Using GPIO PWM audio output (GPIO 12/13)")
@@ -148,6 +248,86 @@ class AudioAlert:
             print("[Alert]   5. Reboot: sudo reboot")
         else:
             print("[Alert] Using USB audio adapter")
+        
+        self._open_pcm()
+        
+        # Playback runs on its own thread so the monitor loop never blocks on audio IO.
+        # At most one alert waits behind the one currently playing.
+        self._queue = queue.Queue(maxsize=1)
+        self._player_thread = threading.Thread(target=self._player, daemon=True)
+        self._player_thread.start()
+    
+    def _load_wav(self):
+        """
+        Read the alert WAV into memory and check its RIFF/WAVE header.
+        
+        Raises at startup instead of silently skipping alerts later, and stops
+        a file deleted mid-operation from muting the horn.
+        """
+        try:
+            with open(self.wav_path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Alert WAV file not found: {self.wav_path}") from None
+        
+        if data[:4] != b"RIFF" or data[8:12] != b"WAVE":
+            raise ValueError(f"Alert file is not a RIFF/WAVE file: {self.wav_path}")
+        
+        print(f"[Alert] Loaded {self.wav_path} ({len(data) // 1024} KB)")
+        return data
+    
+    def _open_pcm(self):
+        """
+        Decode the preloaded WAV and open a long-lived ALSA playback stream.
+        
+        Avoids forking aplay, reopening the device and re-parsing the WAV
+        header on every alert. Falls back to aplay if pyalsaaudio is missing
+        or the device can't be opened; in the latter case the player retries
+        the open every PCM_REOPEN_SEC.
+        """
+        if alsaaudio is None:
+            print("[Alert] pyalsaaudio not available. Using aplay for playback.")
+            return
+        
+        formats = {
+            1: alsaaudio.PCM_FORMAT_U8,
+            2: alsaaudio.PCM_FORMAT_S16_LE,
+            3: alsaaudio.PCM_FORMAT_S24_3LE,
+            4: alsaaudio.PCM_FORMAT_S32_LE,
+        }
+        
+        try:
+            with wave.open(io.BytesIO(self._wav_bytes), 'rb') as wav:
+                channels = wav.getnchannels()
+                rate = wav.getframerate()
+                sampwidth = wav.getsampwidth()
+                frames = wav.readframes(wav.getnframes())
+            
+            if sampwidth not in formats:
+                print(f"[Alert] Unsupported WAV sample width: {sampwidth * 8} bits. Using aplay.")
+                return
+            
+            self._pcm = alsaaudio.PCM(
+                alsaaudio.PCM_PLAYBACK,
+                device=self.device,
+                channels=channels,
+                rate=rate,
+                format=formats[sampwidth],
+                periodsize=self.PERIOD_FRAMES
+            )
+            
+            # Pad the clip to a whole number of periods so every write is full-sized
+            self._period_bytes = self.PERIOD_FRAMES * channels * sampwidth
+            silence = b"\x80" if sampwidth == 1 else b"\x00"
+            padding = -len(frames) % self._period_bytes
+            self._pcm_bytes = frames + silence * padding
+            
+            print(f"[Alert] ALSA stream open on {self.device} ({rate} Hz, {channels} ch, {sampwidth * 8}-bit)")
+        except Exception as e:
+            print(f"[Alert] Could not open ALSA stream ({e}). Using aplay for playback.")
+            self._pcm = None
+            # The device may just not be there yet (USB adapter enumerating at boot)
+            self._pcm_reopen_at = _now() + self.PCM_REOPEN_SEC
     
     def set_min_interval(self, interval_sec):
         """Set minimum interval between alerts."""
@@ -157,9 +337,12 @@ class AudioAlert:
         """
         Play horn warning sound.
         
+        Non-blocking: the alert is queued for the player thread and this
+        returns immediately. Returns True if an alert was queued.
+        
         Output modes:
-        - usb: Uses aplay with default sound card (USB audio adapter)
-        - gpio_pwm: Uses aplay with PWM audio on GPIO 12 (Right) / GPIO 13 (Left)
+        - usb: Plays through the default sound card (USB audio adapter)
+        - gpio_pwm: Plays through PWM audio on GPIO 12 (Right) / GPIO 13 (Left)
         
         For GPIO PWM audio on Pi 5:
         1. Add to /boot/firmware/config.txt:
@@ -168,66 +351,154 @@ class AudioAlert:
         3. Connect amplifier to GPIO 12 (Right channel) or GPIO 13 (Left channel)
         4. GPIO pins output PWM audio signal (NOT line-level - may need amplification)
         """
-        current_time = time.time()
+        current_time = _now()
         
         # Throttle alerts to avoid spam
         if current_time - self.last_alert_time < self.min_interval:
             return False
         
-        if not os.path.exists(self.wav_path):
-            print(f"[Alert] WAV file not found: {self.wav_path}")
+        # Hand off to the player thread; skip if an alert is already pending
+        try:
+            self._queue.put_nowait(True)
+        except queue.Full:
             return False
         
+        self.last_alert_time = current_time
+        
+        # Set display name for mode
+        mode_names = {
+            "gpio_pwm": "GPIO PWM",
+            "headphone_jack": "Headphone Jack",
+            "hdmi": "HDMI",
+            "usb": "USB"
+        }
+        mode_str = mode_names.get(self.output_mode, "USB")
+        log.info("[Alert] Horn triggered (%s) at %s", mode_str, datetime.now().strftime('%H:%M:%S'))
+        return True
+    
+    def _player(self):
+        """Thread: play queued alerts."""
+        while True:
+            self._queue.get()
+            if self._pcm is None and self._pcm_reopen_at is not None and _now() >= self._pcm_reopen_at:
+                self._reopen_pcm()
+            if self._pcm is not None and self._play_pcm():
+                continue
+            # No stream, or it just failed: aplay opens the device fresh so this alert isn't lost
+            self._play_aplay()
+    
+    def _play_pcm(self):
+        """
+        Write the preloaded clip to the open ALSA stream, one period at a time.
+        
+        On a write error (e.g. the USB adapter reset or re-enumerated) the
+        stream is closed and a reopen is scheduled for the next alert;
+        returns False so the caller plays this one through aplay instead.
+        """
         try:
-            # Build aplay command based on output mode
-            if self.output_mode == "gpio_pwm":
-                # For GPIO PWM audio, specify the headphones device
-                # On Pi 5 with PWM overlay, this routes to GPIO 12/13
-                cmd = ["aplay", "-D", "plughw:Headphones", self.wav_path]
-            elif self.output_mode == "headphone_jack":
-                # For onboard 3.5mm jack/speaker - use the Headphones device
-                # This is the built-in audio output on Raspberry Pi
-                cmd = ["aplay", "-D", "plughw:Headphones", self.wav_path]
-            elif self.output_mode == "hdmi":
-                # For HDMI audio output - try multiple approaches for compatibility
-                # Method 1: Use simple hdmi device (usually works best)
-                cmd = ["aplay", "-D", "hdmi", self.wav_path]
-                # Alternative if above fails: cmd = ["aplay", "-D", "hw:CARD=vc4hdmi0", self.wav_path]
-            else:
-                # USB audio - use card 1, device 0 (AB13X USB Audio)
-                cmd = ["aplay", "-D", "plughw:1,0", self.wav_path]
-            
-            # Run command and capture output for debugging
-            result = subprocess.run(
-                cmd,
-                timeout=10,
-                check=False,
-                capture_output=True,
-                text=True
-            )
+            data = memoryview(self._pcm_bytes)
+            for offset in range(0, len(data), self._period_bytes):
+                self._pcm.write(data[offset:offset + self._period_bytes])
+            return True
+        except Exception as e:
+            log.error("[Alert] Error playing audio: %s. Reopening ALSA stream.", e)
+            try:
+                self._pcm.close()
+            except Exception:
+                pass
+            self._pcm = None
+            self._pcm_reopen_at = _now()  # Retry before the next alert; aplay needs the device free now
+            return False
+    
+    def _reopen_pcm(self):
+        """Try to reopen the ALSA stream, at most once per PCM_REOPEN_SEC."""
+        self._open_pcm()
+        if self._pcm is not None:
+            self._pcm_reopen_at = None
+            log.info("[Alert] ALSA stream reopened on %s", self.device)
+        else:
+            self._pcm_reopen_at = _now() + self.PCM_REOPEN_SEC
+    
+    def _open_wav_fd(self):
+        """
+        Put the preloaded WAV in an anonymous in-memory file for aplay's stdin.
+        
+        Each playback just rewinds it, so nothing is copied through a pipe and
+        the original file on disk is never reopened.
+        """
+        if hasattr(os, "memfd_create"):
+            fd = os.memfd_create("forklift-alert.wav")
+        else:
+            fd = os.dup(tempfile.TemporaryFile().fileno())
+        os.write(fd, self._wav_bytes)
+        return fd
+    
+    def _play_aplay(self):
+        """
+        Play the preloaded WAV through aplay (fallback when ALSA stream is unavailable).
+        
+        Started with posix_spawn rather than fork+exec, so the Python process
+        isn't duplicated for every alert. Stdin is the in-memory WAV, stdout is
+        discarded and stderr is kept for debugging audio issues.
+        """
+        try:
+            if self._wav_fd is None:
+                self._wav_fd = self._open_wav_fd()
+            os.lseek(self._wav_fd, 0, os.SEEK_SET)
             
-            # Log any errors (for debugging audio issues)
-            if result.returncode != 0 and result.stderr:
-                print(f"[Alert] Audio playback warning: {result.stderr.strip()}")
+            err_r, err_w = os.pipe()
+            try:
+                pid = os.posix_spawnp(
+                    "aplay",
+                    ["aplay", "-q", "-D", self.device, "-"],
+                    os.environ,
+                    file_actions=[
+                        (os.POSIX_SPAWN_DUP2, self._wav_fd, 0),
+                        (os.POSIX_SPAWN_OPEN, 1, os.devnull, os.O_WRONLY, 0),
+                        (os.POSIX_SPAWN_DUP2, err_w, 2),
+                    ]
+                )
+            except BaseException:
+                os.close(err_r)
+                raise
+            finally:
+                os.close(err_w)
             
-            self.last_alert_time = current_time
+            returncode, stderr = self._wait_aplay(pid, err_r)
             
-            # Set display name for mode
-            mode_names = {
-                "gpio_pwm": "GPIO PWM",
-                "headphone_jack": "Headphone Jack",
-                "hdmi": "HDMI",
-                "usb": "USB"
-            }
-            mode_str = mode_names.get(self.output_mode, "USB")
-            print(f"[Alert] Horn triggered ({mode_str}) at {datetime.now().strftime('%H:%M:%S')}")
+            # Log any errors (for debugging audio issues)
+            if returncode != 0 and stderr:
+                log.warning("[Alert] Audio playback warning: %s", stderr.decode(errors='replace').strip())
             return True
         except FileNotFoundError:
-            print("[Alert] aplay not found. Install alsa-utils: sudo apt install -y alsa-utils")
+            log.error("[Alert] aplay not found. Install alsa-utils: sudo apt install -y alsa-utils")
             return False
         except Exception as e:
-            print(f"[Alert] Error playing audio: {e}")
+            log.error("[Alert] Error playing audio: %s", e)
             return False
+    
+    def _wait_aplay(self, pid, err_fd):
+        """Collect aplay's stderr until it exits, killing it after APLAY_TIMEOUT_SEC."""
+        deadline = _now() + self.APLAY_TIMEOUT_SEC
+        chunks = []
+        try:
+            while True:
+                remaining = deadline - _now()
+                if remaining <= 0:
+                    os.kill(pid, signal.SIGKILL)
+                    log.warning("[Alert] aplay timed out after %ss", self.APLAY_TIMEOUT_SEC)
+                    break
+                readable, _, _ = select.select([err_fd], [], [], remaining)
+                if readable:
+                    chunk = os.read(err_fd, 4096)
+                    if not chunk:
+                        break  # stderr closed: aplay exited
+                    chunks.append(chunk)
+        finally:
+            os.close(err_fd)
+        
+        _, status = os.waitpid(pid, 0)
+        return os.waitstatus_to_exitcode(status), b"".join(chunks)
 
 
 # ============================================
@@ -241,21 +512,42 @@ class PauseButton:
     Wiring:
       - Button COM → Pi GND
       - Button NO → Pi GPIO17
-      - Pull-up enabled in gpiozero
+      - Internal pull-up enabled (libgpiod or gpiozero)
     
     Behavior:
       - Press → silence alerts for duration
       - LED or indicator can show pause status
+    
+    Uses libgpiod falling-edge events when available: the kernel timestamps
+    each edge and the owner's event loop watches fileno() and calls
+    read_edge_events(), so nothing polls the pin. Falls back to gpiozero
+    otherwise.
     """
     
-    def __init__(self, gpio_pin=17):
+    DEBOUNCE_NS = 50_000_000  # Ignore edges within 50 ms of the last accepted one
+    
+    def __init__(self, gpio_pin=17, wakeup=None, gpio_chip="/dev/gpiochip4"):
+        """
+        Args:
+            gpio_pin: BCM GPIO pin number for the button
+            wakeup: Optional callable invoked on press to wake the monitor loop
+            gpio_chip: GPIO character device (Pi 5 header pins are on gpiochip4)
+        """
         self.gpio_pin = gpio_pin
+        self.gpio_chip = gpio_chip
+        self.wakeup = wakeup
         self.pause_until = 0
-        self.button = None
+        self.button = None       # gpiozero Button
+        self.request = None      # libgpiod line request
+        self._last_edge_ns = None
+        self._press_pending = False
         self._init_button()
     
     def _init_button(self):
         """Initialize GPIO button with pull-up."""
+        if gpiod is not None and self._init_gpiod():
+            return
+        
         if Button is None:
             print("[Button] gpiozero not available. GPIO disabled.")
             return
@@ -275,9 +567,49 @@ class PauseButton:
             print(f"[Button] Error initializing GPIO{self.gpio_pin}: {e}")
             self.button = None
     
+    def _init_gpiod(self):
+        """Request the line for falling-edge events via libgpiod. Returns True on success."""
+        try:
+            self.request = gpiod.request_lines(
+                self.gpio_chip,
+                consumer="forklift-pause",
+                config={
+                    self.gpio_pin: gpiod.LineSettings(
+                        edge_detection=Edge.FALLING,  # Button grounds GPIO when pressed
+                        bias=Bias.PULL_UP
+                    )
+                }
+            )
+        except Exception as e:
+            print(f"[Button] libgpiod request failed on {self.gpio_chip} GPIO{self.gpio_pin}: {e}")
+            self.request = None
+            return False
+        
+        print(f"[Button] Pause button initialized on GPIO{self.gpio_pin} (libgpiod edge events)")
+        return True
+    
+    def fileno(self):
+        """Line request FD that becomes readable on an edge, or None without libgpiod."""
+        return self.request.fd if self.request is not None else None
+    
+    def read_edge_events(self):
+        """Dispatch every queued falling edge. Call when fileno() is readable."""
+        for event in self.request.read_edge_events():
+            self._handle_edge(event.timestamp_ns)
+    
+    def _handle_edge(self, timestamp_ns):
+        """Software debounce using the kernel's monotonic edge timestamp."""
+        if self._last_edge_ns is not None and timestamp_ns - self._last_edge_ns < self.DEBOUNCE_NS:
+            return
+        self._last_edge_ns = timestamp_ns
+        self._on_button_press()
+    
     def _on_button_press(self):
         """Called when pause button is pressed."""
-        print("[Button] PAUSE button pressed")
+        log.info("[Button] PAUSE button pressed")
+        self._press_pending = True
+        if self.wakeup is not None:
+            self.wakeup()
     
     def set_pause(self, duration_seconds):
         """
@@ -286,19 +618,197 @@ class PauseButton:
         Args:
             duration_seconds: How long to pause (typically 120 for 2 minutes)
         """
-        self.pause_until = time.time() + duration_seconds
+        self.pause_until = _now() + duration_seconds
         minutes = duration_seconds / 60
-        print(f"[Pause] Alerts paused for {minutes:.1f} minutes until {datetime.now() + timedelta(seconds=duration_seconds)}")
+        log.info("[Pause] Alerts paused for %.1f minutes until %s", minutes, datetime.now() + timedelta(seconds=duration_seconds))
     
     def is_paused(self):
         """Check if we're currently in pause period."""
-        return time.time() < self.pause_until
+        return _now() < self.pause_until
     
     def pause_button_active(self):
-        """Check if button is currently physically pressed."""
-        if self.button is None:
+        """
+        Check if button was pressed since the last call.
+        
+        Presses are latched so a short tap is never missed between monitor loop
+        wakeups. With libgpiod only the debounced edge counts (the pin level is
+        never read); with gpiozero a held button also reads as active.
+        """
+        if self._press_pending:
+            self._press_pending = False
+            return True
+        if self.request is not None:
             return False
-        return self.button.is_pressed
+        if self.button is not None:
+            return self.button.is_pressed
+        return False
+
+
+# ============================================
+# BATCHED UDP RECEIVE (recvmmsg)
+# ============================================
+
+class _IOVec(ctypes.Structure):
+    _fields_ = [("iov_base", ctypes.c_void_p), ("iov_len", ctypes.c_size_t)]
+
+
+class _SockAddrIn(ctypes.Structure):
+    _fields_ = [
+        ("sin_family", ctypes.c_ushort),
+        ("sin_port", ctypes.c_uint16),      # Network byte order
+        ("sin_addr", ctypes.c_ubyte * 4),
+        ("sin_zero", ctypes.c_ubyte * 8),
+    ]
+
+
+class _MsgHdr(ctypes.Structure):
+    _fields_ = [
+        ("msg_name", ctypes.c_void_p),
+        ("msg_namelen", ctypes.c_uint32),
+        ("msg_iov", ctypes.POINTER(_IOVec)),
+        ("msg_iovlen", ctypes.c_size_t),
+        ("msg_control", ctypes.c_void_p),
+        ("msg_controllen", ctypes.c_size_t),
+        ("msg_flags", ctypes.c_int),
+    ]
+
+
+class _MMsgHdr(ctypes.Structure):
+    _fields_ = [("msg_hdr", _MsgHdr), ("msg_len", ctypes.c_uint)]
+
+
+def _load_recvmmsg():
+    """Bind libc recvmmsg() via ctypes, or return None if unavailable (non-Linux)."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        fn = ctypes.CDLL(None, use_errno=True).recvmmsg
+    except (OSError, AttributeError):
+        return None
+    fn.argtypes = [ctypes.c_int, ctypes.POINTER(_MMsgHdr), ctypes.c_uint, ctypes.c_int, ctypes.c_void_p]
+    fn.restype = ctypes.c_int
+    return fn
+
+
+_recvmmsg = _load_recvmmsg()
+
+
+class _BatchReceiver:
+    """
+    Drain up to `batch` queued datagrams from a socket with one recvmmsg() call.
+    
+    Buffers and message headers are allocated once and reused for every call.
+    """
+    
+    def __init__(self, sock, batch=32, bufsize=64):
+        self.sock = sock
+        self.batch = batch
+        self.bufsize = bufsize
+        
+        self._bufs = ctypes.create_string_buffer(batch * bufsize)
+        self._iovs = (_IOVec * batch)()
+        self._addrs = (_SockAddrIn * batch)()
+        self._msgs = (_MMsgHdr * batch)()
+        
+        base = ctypes.addressof(self._bufs)
+        for i in range(batch):
+            self._iovs[i].iov_base = base + i * bufsize
+            self._iovs[i].iov_len = bufsize
+            hdr = self._msgs[i].msg_hdr
+            hdr.msg_name = ctypes.addressof(self._addrs[i])
+            hdr.msg_namelen = ctypes.sizeof(_SockAddrIn)
+            hdr.msg_iov = ctypes.pointer(self._iovs[i])
+            hdr.msg_iovlen = 1
+    
+    def recv(self):
+        """
+        Return a list of (data, (ip, port)) for every datagram currently queued.
+        
+        The socket must be non-blocking; returns an empty list if nothing
+        is waiting.
+        """
+        count = _recvmmsg(self.sock.fileno(), self._msgs, self.batch, 0, None)
+        if count < 0:
+            err = ctypes.get_errno()
+            if err in (errno.EAGAIN, errno.EWOULDBLOCK, errno.EINTR):
+                return []
+            raise OSError(err, os.strerror(err))
+        
+        raw = self._bufs.raw
+        packets = []
+        for i in range(count):
+            msg = self._msgs[i]
+            offset = i * self.bufsize
+            length = min(msg.msg_len, self.bufsize)
+            addr = self._addrs[i]
+            packets.append((
+                raw[offset:offset + length],
+                (socket.inet_ntoa(bytes(addr.sin_addr)), socket.ntohs(addr.sin_port))
+            ))
+            msg.msg_hdr.msg_namelen = ctypes.sizeof(_SockAddrIn)  # Kernel overwrote it
+        return packets
+
+
+class _DistanceFilter:
+    """
+    Median over the valid readings among the last `window` of both sensors.
+    
+    Readings live in one (2, window) float32 ring, a row per sensor, so both
+    medians come from a single sort; without numpy two plain lists and
+    statistics.median are used.
+    
+    Error readings (<= 0) are left out of the median rather than counted as
+    "far": ultrasonic sensors often alternate echoes with timeouts when close
+    to a target, and counting those timeouts would hide the close readings
+    and silence the horn. A sensor reports its raw error value only when
+    the window holds no valid reading at all.
+    """
+    
+    def __init__(self, window=5):
+        self.window = max(1, int(window or 1))
+        self._index = 0
+        if numpy is not None:
+            self._ring = numpy.empty((2, self.window), dtype=numpy.float32)
+            self._rows = numpy.arange(2)
+        else:
+            self._ring = [[0.0] * self.window, [0.0] * self.window]
+        self.reset()
+    
+    def reset(self):
+        """Forget all readings (e.g. after the sender went quiet)."""
+        self._index = 0
+        if numpy is not None:
+            self._ring.fill(numpy.inf)
+        else:
+            for row in self._ring:
+                row[:] = [float("inf")] * self.window
+    
+    def update(self, d1, d2):
+        """Store one reading per sensor and return the filtered (d1, d2)."""
+        i = self._index
+        self._index = (i + 1) % self.window
+        # Errors and empty slots are stored as +inf so they sort after valid readings
+        if numpy is not None:
+            self._ring[0, i] = d1 if d1 > 0 else numpy.inf
+            self._ring[1, i] = d2 if d2 > 0 else numpy.inf
+            ordered = numpy.sort(self._ring, axis=1)
+            valid = numpy.count_nonzero(ordered != numpy.inf, axis=1)
+            lo = ordered[self._rows, numpy.maximum(valid - 1, 0) // 2]
+            hi = ordered[self._rows, valid // 2]
+            m1, m2 = ((lo + hi) / 2).tolist()
+        else:
+            self._ring[0][i] = d1 if d1 > 0 else float("inf")
+            self._ring[1][i] = d2 if d2 > 0 else float("inf")
+            m1 = self._valid_median(self._ring[0])
+            m2 = self._valid_median(self._ring[1])
+        # No valid reading in the window: the current one is an error, pass it on
+        return (m1 if m1 != float("inf") else d1), (m2 if m2 != float("inf") else d2)
+    
+    @staticmethod
+    def _valid_median(row):
+        """Median of the finite entries of row, or +inf if there are none."""
+        valid = [v for v in row if v != float("inf")]
+        return statistics.median(valid) if valid else float("inf")
 
 
 # ============================================
@@ -309,104 +819,248 @@ class UDPListener:
     """
     Receive distance data from ESP32-C6 over UDP.
     
-    Packet format: "D1:xxx.x,D2:yyy.y\n"
+    Binary packet format (little-endian, 13 bytes): <BIff>
+      byte 0:     magic/version 0xA6
+      bytes 1-4:  sequence number (uint32, wraps)
+      bytes 5-12: distance 1, distance 2 (float32 cm)
+    
+    Duplicate or reordered (older) binary packets are dropped per sender.
+    Each sender's readings are median-filtered over its last `filter_window`
+    packets so single-sample ultrasonic glitches don't sound the horn. The
+    published distance per sensor is the closest filtered value among
+    senders heard within SEQ_RESET_SEC, so one unit's obstacle is never
+    hidden by another unit's clear reading.
+    
+    Legacy text format (still accepted): "D1:xxx.x,D2:yyy.y\n"
     Example: "D1:45.3,D2:67.8\n"
     -1.0 = sensor error/timeout
+    
+    The listener owns no thread: start() binds a non-blocking socket and the
+    caller's event loop calls drain() whenever it becomes readable.
     """
     
-    def __init__(self, listen_port=5005):
+    BINARY_MAGIC = 0xA6
+    BINARY_PACKET = struct.Struct('<BIff')
+    SEQ_REORDER_WINDOW = 64  # Packets further behind than this mean the sender restarted
+    SEQ_RESET_SEC = 2.0      # Silence longer than this also resets sequence tracking
+    PACKET_PATTERN = re.compile(rb"D1:(-?\d+(?:\.\d+)?),D2:(-?\d+(?:\.\d+)?)")
+    
+    SO_RCVBUFFORCE = getattr(socket, "SO_RCVBUFFORCE", 33)  # Linux; not exported by Python
+    
+    def __init__(self, listen_port=5005, rcvbuf_bytes=4 * 1024 * 1024,
+                 rx_cpus=None, rx_nice=None, socket_priority=None, filter_window=5):
+        """
+        Args:
+            listen_port: UDP port to bind
+            rcvbuf_bytes: Requested kernel receive buffer
+            rx_cpus: CPUs to pin the receive loop to (e.g. [3]), None = no pinning
+            rx_nice: Nice value for the receive loop (e.g. -5, needs CAP_SYS_NICE)
+            socket_priority: SO_PRIORITY for the socket (0-6)
+            filter_window: Readings per sensor in the median filter (1 = off)
+        """
         self.listen_port = listen_port
-        self.socket = None
+        self.rcvbuf_bytes = rcvbuf_bytes
+        self.rx_cpus = rx_cpus
+        self.rx_nice = rx_nice
+        self.socket_priority = socket_priority
+        self.sock = None
         self.running = False
-        self.thread = None
+        self._receiver = None  # recvmmsg batch reader, None = recvfrom per packet
         
-        self.latest_distance_1 = 0.0
-        self.latest_distance_2 = 0.0
-        self.last_update_time = 0
+        # Latest filtered (distance_1, distance_2, monotonic receive time). Replaced
+        # as a whole tuple so readers never see distances and timestamp out of step.
+        self._snapshot = (0.0, 0.0, 0.0)
+        self.filter_window = filter_window
         self.source_ip = None
         self.source_port = None
+        
+        # (last sequence number, time seen) per sender IP
+        self._last_seq = {}
+        
+        # Median filter and latest filtered (d1, d2, time) per sender IP
+        self._filters = {}
+        self._readings = {}
     
     def start(self):
-        """Start listening for UDP packets."""
+        """
+        Start listening for UDP packets.
+        
+        Register self.sock with a selector and call drain() when it is readable.
+        """
         try:
-            self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            self.socket.bind(('0.0.0.0', self.listen_port))
-            self.socket.settimeout(1.0)  # 1 second receive timeout
-            
             self.running = True
-            self.thread = threading.Thread(target=self._receive_loop, daemon=True)
-            self.thread.start()
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock.bind(('0.0.0.0', self.listen_port))
+            sock.setblocking(False)
+            self._set_receive_buffer(sock)
+            if self.socket_priority is not None:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_PRIORITY, int(self.socket_priority))
+            self.sock = sock
+            if _recvmmsg is not None:
+                self._receiver = _BatchReceiver(sock)
             
             print(f"[UDP] Listening on port {self.listen_port}")
         except Exception as e:
             print(f"[UDP] Error starting listener: {e}")
     
+    def _set_receive_buffer(self, sock):
+        """
+        Enlarge the kernel receive buffer so packet bursts queue up while
+        Python is busy (audio playback, GC, status prints) instead of being dropped.
+        
+        SO_RCVBUFFORCE (needs CAP_NET_ADMIN) ignores net.core.rmem_max; without
+        the capability fall back to SO_RCVBUF, which Linux caps at rmem_max.
+        Either way the kernel doubles the value, so read it back and report
+        what was actually granted.
+        """
+        if not self.rcvbuf_bytes:
+            return
+        
+        try:
+            try:
+                sock.setsockopt(socket.SOL_SOCKET, self.SO_RCVBUFFORCE, int(self.rcvbuf_bytes))
+            except OSError:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, int(self.rcvbuf_bytes))
+            actual = sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+            print(f"[UDP] Receive buffer: {actual // 1024} KB (requested {int(self.rcvbuf_bytes) // 1024} KB)")
+            if actual < self.rcvbuf_bytes:
+                print("[UDP] Buffer capped by kernel. Raise with: sudo sysctl -w net.core.rmem_max=12582912")
+        except OSError as e:
+            print(f"[UDP] Could not set receive buffer: {e}")
+    
     def stop(self):
         """Stop listening."""
         self.running = False
-        if self.socket:
+        if self.sock is not None:
             try:
-                self.socket.close()
+                self.sock.close()
             except:
                 pass
     
-    def _receive_loop(self):
-        """Thread: receive UDP packets."""
-        last_source_ip = None
+    def tune_current_thread(self):
+        """
+        Pin the calling thread to rx_cpus and raise its priority so the
+        receive loop isn't starved by audio playback or other processes.
+        
+        Both calls act on the current thread only (Linux tid semantics).
+        Raising priority needs CAP_SYS_NICE (see service/forklift.service).
+        """
+        tid = threading.get_native_id()
+        
+        if self.rx_cpus:
+            try:
+                os.sched_setaffinity(0, set(self.rx_cpus))
+                log.info("[UDP] Receive loop pinned to CPU %s", sorted(self.rx_cpus))
+            except (AttributeError, OSError, ValueError) as e:
+                log.warning("[UDP] Could not set CPU affinity: %s", e)
+        
+        if self.rx_nice is not None:
+            try:
+                os.setpriority(os.PRIO_PROCESS, tid, int(self.rx_nice))
+                log.info("[UDP] Receive loop nice set to %s", self.rx_nice)
+            except (AttributeError, OSError) as e:
+                log.warning("[UDP] Could not set nice %s (needs CAP_SYS_NICE): %s", self.rx_nice, e)
+    
+    def drain(self):
+        """
+        Read every datagram queued on the readable socket and parse it.
+        
+        Uses recvmmsg() to pick up a whole batch per syscall, falling back
+        to one recvfrom() per packet where it isn't available. Returns once
+        the socket would block.
+        """
+        sock = self.sock
+        receiver = self._receiver
         while self.running:
             try:
-                data, addr = self.socket.recvfrom(1024)
-                self.last_update_time = time.time()
-                
-                # Store source IP and port for status display
-                source_ip = addr[0]
-                self.source_ip = source_ip
-                self.source_port = addr[1]
-                
-                # Log source IP when it changes (helpful for NO-ROUTER debugging)
-                if source_ip != last_source_ip:
-                    #print(f"[UDP] Receiving from ESP32 at {source_ip}:{addr[1]}")
-                    last_source_ip = source_ip
-                
-                # Parse packet: "D1:xxx.x,D2:yyy.y\n"
-                message = data.decode('utf-8', errors='ignore').strip()
-                self._parse_packet(message)
-                
-            except socket.timeout:
-                pass  # Normal timeout
-            except Exception as e:
+                if receiver is None:
+                    packets = [sock.recvfrom(1024)]
+                else:
+                    packets = receiver.recv()
+                    if not packets:
+                        return
+            except BlockingIOError:
+                return
+            except OSError as e:
                 if self.running:
-                    print(f"[UDP] Receive error: {e}")
-    
-    def _parse_packet(self, message):
-        """Parse distance packet from ESP."""
-        try:
-            # Expected format: "D1:45.3,D2:67.8"
-            parts = message.split(',')
-            
-            # Parse D1
-            if len(parts) >= 1:
-                d1_str = parts[0].split(':')
-                if len(d1_str) == 2:
-                    self.latest_distance_1 = float(d1_str[1])
+                    log.error("[UDP] Receive error: %s", e)
+                return
             
-            # Parse D2
-            if len(parts) >= 2:
-                d2_str = parts[1].split(':')
-                if len(d2_str) == 2:
-                    self.latest_distance_2 = float(d2_str[1])
+            # Packets are in arrival order, so the newest reading wins
+            for data, addr in packets:
+                # Store source IP and port for status display
+                self.source_ip, self.source_port = addr
+                self._parse_bytes(data, addr[0])
             
-        except Exception as e:
-            # Silently ignore parse errors
-            pass
+            if receiver is not None and len(packets) < receiver.batch:
+                return  # Queue emptied without another syscall
     
-    def get_distances(self):
-        """Get latest distance readings."""
-        return self.latest_distance_1, self.latest_distance_2
+    def _parse_bytes(self, data, source=None):
+        """
+        Parse distance packet from ESP directly from the raw datagram.
+        
+        Binary packets (first byte 0xA6) are decoded with a single
+        struct.unpack_from and dropped if their sequence number is not
+        newer than the last one seen from `source`. Anything else goes through the legacy text path,
+        a single precompiled regex scan. Malformed packets are ignored.
+        """
+        if len(data) >= self.BINARY_PACKET.size and data[0] == self.BINARY_MAGIC:
+            _, seq, d1, d2 = self.BINARY_PACKET.unpack_from(data)
+            if not self._is_new_sequence(source, seq):
+                return
+        else:
+            # Legacy format: b"D1:45.3,D2:67.8\n"
+            m = self.PACKET_PATTERN.search(data)
+            if m is None:
+                return
+            d1 = float(m.group(1))
+            d2 = float(m.group(2))
+        
+        now = _now()
+        filt = self._filters.get(source)
+        if filt is None:
+            filt = self._filters[source] = _DistanceFilter(self.filter_window)
+        elif now - self._readings[source][2] > self.SEQ_RESET_SEC:
+            filt.reset()  # Don't mix in readings from before a dropout
+        d1, d2 = filt.update(d1, d2)
+        self._readings[source] = (d1, d2, now)
+        self._snapshot = (self._closest(0, d1, now), self._closest(1, d2, now), now)
     
-    def is_data_fresh(self, timeout_sec=2.0):
-        """Check if we've received data recently."""
-        return (time.time() - self.last_update_time) < timeout_sec
+    def _closest(self, sensor, current, now):
+        """
+        Smallest valid filtered reading for one sensor across live senders.
+        
+        Senders silent for more than SEQ_RESET_SEC are skipped so a unit that
+        went offline can't hold an alert. Falls back to `current` (the sender
+        just heard) when no live sender has a valid reading.
+        """
+        closest = None
+        for reading in self._readings.values():
+            d = reading[sensor]
+            if d > 0 and now - reading[2] <= self.SEQ_RESET_SEC and (closest is None or d < closest):
+                closest = d
+        return closest if closest is not None else current
+    
+    def _is_new_sequence(self, source, seq):
+        """
+        Check a packet's sequence number against the last one from the same sender.
+        
+        Uses modular distance so uint32 wraparound is handled. A packet more
+        than SEQ_REORDER_WINDOW behind, or after a gap of SEQ_RESET_SEC, is
+        taken as a sender restart and accepted.
+        """
+        now = _now()
+        last = self._last_seq.get(source)
+        if last is not None and now - last[1] < self.SEQ_RESET_SEC:
+            behind = (last[0] - seq) & 0xFFFFFFFF
+            if behind < self.SEQ_REORDER_WINDOW:
+                return False  # Duplicate (behind == 0) or out of order
+        self._last_seq[source] = (seq, now)
+        return True
+    
+    def snapshot(self):
+        """Get latest (distance_1, distance_2, receive_time) as one consistent tuple, merged across senders."""
+        return self._snapshot
     
     def get_source_info(self):
         """Get ESP32 source IP and port."""
@@ -420,8 +1074,13 @@ class UDPListener:
 class ForkliftAlertSystem:
     """
     Main control system for fork height monitoring and alerting.
+    
+    UDP receive, button edges and alert evaluation all run on the main thread
+    in one selector loop; only audio playback has its own worker thread.
     """
     
+    DATA_TIMEOUT_SEC = 2.0  # Sensor data older than this is reported as stale
+    
     def __init__(self, config_path="/home/mark/Mezzanine/raspberrypi/config.json"):
         print("=" * 60)
         print("Forklift Ultrasonic Warning System - Raspberry Pi")
@@ -429,7 +1088,7 @@ class ForkliftAlertSystem:
         
         # Load configuration
         self.config = Config(config_path)
-        print(f"\n[System] Configuration:")
+        print("\n[System] Configuration:")
         print(f"  UDP Port: {self.config.get('udp_listen_port')}")
         print(f"  Threshold: {self.config.get('distance_threshold_cm')} cm")
         print(f"  Pause Duration: {self.config.get('pause_duration_seconds')} sec")
@@ -437,59 +1096,125 @@ class ForkliftAlertSystem:
         print(f"  Pause GPIO: {self.config.get('pause_button_gpio')}")
         
         # Initialize components
-        self.listener = UDPListener(self.config.get('udp_listen_port'))
+        self.listener = UDPListener(
+            self.config.get('udp_listen_port'),
+            rcvbuf_bytes=self.config.get('udp_rcvbuf_bytes'),
+            rx_cpus=self.config.get('udp_rx_cpus'),
+            rx_nice=self.config.get('udp_rx_nice'),
+            socket_priority=self.config.get('udp_socket_priority'),
+            filter_window=self.config.get('distance_filter_window')
+        )
         self.alert = AudioAlert(
             self.config.get('alert_wav_path'),
             output_mode=self.config.get('audio_output', 'usb')
         )
-        self.alert.set_min_interval(self.config.get('min_interval_between_alerts_sec'))
-        self.pause_button = PauseButton(self.config.get('pause_button_gpio'))
+        
+        # gpiozero calls back from its own thread; a byte on this pair wakes the selector
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        self.pause_button = PauseButton(
+            self.config.get('pause_button_gpio'),
+            wakeup=self._wake,
+            gpio_chip=self.config.get('pause_button_gpiochip')
+        )
+        
+        # Cache hot-loop settings (refreshed when config.json changes)
+        self._apply_config()
         
         # State
         self.running = True
         self.alert_triggered = False
-        self.startup_time = time.time()
+        self.startup_time = _now()
+        self._stop_signal = None
         
         # Register signal handlers for clean shutdown
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
     
+    def _apply_config(self):
+        """Copy config values used by the monitor loop into attributes."""
+        self._threshold = float(self.config.get('distance_threshold_cm'))
+        self._pause_secs = int(self.config.get('pause_duration_seconds'))
+        self.alert.set_min_interval(self.config.get('min_interval_between_alerts_sec'))
+    
     def _signal_handler(self, signum, frame):
-        """Handle Ctrl-C and kill signals for clean shutdown."""
-        print(f"\n[System] Received signal {signum}. Shutting down...")
-        self.shutdown()
+        """
+        Handle Ctrl-C and kill signals for clean shutdown.
+        
+        Only flags the loop to stop and wakes the selector. The handler runs
+        between bytecodes of the main thread, which may be holding the log
+        queue's lock or stdout's buffer, so logging, printing or flushing
+        from here could deadlock. shutdown() runs once the loop has returned.
+        """
+        self._stop_signal = signum
+        self.running = False
+        self._wake()
     
     def start(self):
         """Start the monitoring system."""
         print("\n[System] Starting UDP listener...")
         self.listener.start()
         
+        self.selector = selectors.DefaultSelector()
+        if self.listener.sock is not None:
+            self.selector.register(self.listener.sock, selectors.EVENT_READ, self._on_udp)
+        if self.pause_button.fileno() is not None:
+            self.selector.register(self.pause_button.fileno(), selectors.EVENT_READ, self._on_button)
+        self.selector.register(self._wake_r, selectors.EVENT_READ, self._on_wakeup)
+        
         print("[System] System ready. Monitoring for forks...\n")
         time.sleep(1)
         
-        # Main monitoring loop
+        # Main monitoring loop (returns once a signal clears self.running)
         self._monitor_loop()
+        self.shutdown()
+    
+    def _on_udp(self, sock):
+        """Selector callback: the UDP socket is readable."""
+        self.listener.drain()
+    
+    def _on_button(self, fd):
+        """Selector callback: the libgpiod line FD has edge events."""
+        self.pause_button.read_edge_events()
+    
+    def _on_wakeup(self, sock):
+        """Selector callback: discard wakeup bytes written by _wake()."""
+        try:
+            while sock.recv(64):
+                pass
+        except BlockingIOError:
+            pass
+    
+    def _wake(self):
+        """Wake the selector loop from another thread (gpiozero button callback)."""
+        try:
+            self._wake_w.send(b"\0")
+        except BlockingIOError:
+            pass  # Already a wakeup pending
     
     def _monitor_loop(self):
         """
-        Main loop: monitor distances and trigger alerts.
+        Main loop: wait for packets or button edges, then evaluate alerts.
         """
+        self.listener.tune_current_thread()
         last_status_time = 0
         last_config_check = 0
         
         while self.running:
             try:
-                current_time = time.time()
+                current_time = _now()
                 
                 # Check for config file changes every 5 seconds
                 if current_time - last_config_check >= 5.0:
                     last_config_check = current_time
                     if self.config.check_and_reload():
-                        # Update alert min interval if config changed
-                        self.alert.set_min_interval(self.config.get('min_interval_between_alerts_sec'))
+                        # Refresh cached settings if config changed
+                        self._apply_config()
                 
-                # Get latest sensor data
-                dist1, dist2 = self.listener.get_distances()
+                # Get latest sensor data (distances and timestamp from the same packet)
+                dist1, dist2, data_time = self.listener.snapshot()
+                data_fresh = (current_time - data_time) < self.DATA_TIMEOUT_SEC
                 
                 # Use minimum distance (either sensor can trigger alert)
                 # Ignore negative values (sensor errors)
@@ -508,12 +1233,12 @@ class ForkliftAlertSystem:
                 
                 # If button is currently pressed, activate pause
                 if button_pressed and not is_paused:
-                    self.pause_button.set_pause(self.config.get('pause_duration_seconds'))
+                    self.pause_button.set_pause(self._pause_secs)
                     is_paused = True
                 
                 # Check threshold and trigger alert
                 # Alert when distance is BELOW threshold (something is too close)
-                threshold = self.config.get('distance_threshold_cm')
+                threshold = self._threshold
                 should_alert = (not is_paused and 
                                min_distance > 0 and 
                                min_distance < threshold)
@@ -525,7 +1250,8 @@ class ForkliftAlertSystem:
                         # Print which ESP32 triggered the alert
                         source_ip, source_port = self.listener.get_source_info()
                         if source_ip:
-                            print(f"[Alert] TRIGGERED BY ESP32: {source_ip}:{source_port} - Distance: {min_distance:.1f}cm (Threshold: {threshold}cm)")
+                            log.info("[Alert] TRIGGERED BY ESP32: %s:%s - Distance: %.1fcm (Threshold: %gcm)",
+                                     source_ip, source_port, min_distance, threshold)
                 else:
                     self.alert_triggered = False
                 
@@ -534,26 +1260,33 @@ class ForkliftAlertSystem:
                     last_status_time = current_time
                     status = "[ALERT]" if self.alert_triggered else "[OK]"
                     pause_status = " [PAUSED]" if is_paused else ""
-                    data_status = " [Data OK]" if self.listener.is_data_fresh() else " [Data STALE]"
+                    data_status = " [Data OK]" if data_fresh else " [Data STALE]"
                     
                     # Get ESP32 source info
                     source_ip, source_port = self.listener.get_source_info()
                     source_info = f" ESP32: {source_ip}:{source_port}" if source_ip else " ESP32: N/A"
                     
-                    print(f"{status} D1={dist1:6.1f}cm D2={dist2:6.1f}cm Min={min_distance:6.1f}cm{pause_status}{data_status}{source_info}")
+                    log.info("%s D1=%6.1fcm D2=%6.1fcm Min=%6.1fcm%s%s%s",
+                             status, dist1, dist2, min_distance, pause_status, data_status, source_info)
                 
-                # Small sleep to prevent CPU spin
-                time.sleep(0.1)
+                # Sleep until the next packet (or button press) arrives and
+                # handle it here. The timeout keeps status and config checks
+                # running with no data.
+                for key, _ in self.selector.select(timeout=5.0):
+                    key.data(key.fileobj)
                 
             except Exception as e:
-                print(f"[System] Error in monitor loop: {e}")
+                log.error("[System] Error in monitor loop: %s", e)
                 time.sleep(1)
     
     def shutdown(self):
-        """Clean shutdown."""
+        """Clean shutdown. Called on the main thread after the monitor loop exits."""
         self.running = False
+        if self._stop_signal is not None:
+            print(f"\n[System] Received signal {self._stop_signal}. Shutting down...")
         print("[System] Stopping listener...")
         self.listener.stop()
+        _log_listener.stop()  # Flush queued log records
         print("[System] System stopped.")
         sys.exit(0)
 